@@ -1,18 +1,44 @@
-import requests
-from web3 import Web3
+import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
+from web3 import AsyncWeb3, Web3
+from web3.exceptions import TransactionNotFound
 import asyncio
+import functools
 import json
+import logging
+import multiprocessing
+import queue
+import re
 import time
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
-from typing import Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+from urllib.parse import urlencode
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
+import signer
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Log through a queue: records are merged (msg % args) in the calling thread, while final formatting
+# and the stream write happen on a background listener thread, off the request path
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "WARNING").upper())
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_stream_handler)
+_log_listener.start()
+
 # Get API key from environment variables
 INCH_API_KEY = os.getenv("INCH_API_KEY")  # Get API key from .env file
 if not INCH_API_KEY:
@@ -20,6 +46,116 @@ if not INCH_API_KEY:
 
 AUTO_APPROVE = True  # Hardcoded auto-approve setting
 
+# Map chain IDs to their respective RPC URLs
+CHAIN_RPC_URLS = {
+    1: "https://eth-mainnet.g.alchemy.com/v2/NMsHzNgJ7XUYtzNyFpEJ8yT4muQ_lkRF",      # Ethereum mainnet
+    10: "https://opt-mainnet.g.alchemy.com/v2/NMsHzNgJ7XUYtzNyFpEJ8yT4muQ_lkRF",     # Optimism mainnet
+    8453: "https://base-mainnet.g.alchemy.com/v2/NMsHzNgJ7XUYtzNyFpEJ8yT4muQ_lkRF",  # Base mainnet
+    42161: "https://arb-mainnet.g.alchemy.com/v2/NMsHzNgJ7XUYtzNyFpEJ8yT4muQ_lkRF"   # Arbitrum mainnet
+}
+
+# 1inch AggregationRouterV6 (the spender for swaps), same address on every supported chain
+ROUTER_ADDRESS = {
+    1: "0x111111125421cA6dc452d289314280a0f8842A65",
+    10: "0x111111125421cA6dc452d289314280a0f8842A65",
+    8453: "0x111111125421cA6dc452d289314280a0f8842A65",
+    42161: "0x111111125421cA6dc452d289314280a0f8842A65"
+}
+
+# Placeholder address 1inch uses for the chain's native token (never needs approval)
+NATIVE_TOKEN_ADDRESS = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+
+MAX_UINT256 = 2**256 - 1
+
+# Receipt polling backoff (seconds): 1, 2, 4, 8, then capped at roughly one mainnet block
+RECEIPT_POLL_INITIAL = 1
+RECEIPT_POLL_MAX = 12
+
+# Function selector of ERC-20 approve(address,uint256)
+ERC20_APPROVE_SELECTOR = bytes.fromhex("095ea7b3")
+
+# Gas ceiling for a plain ERC-20 approve(spender, amount) when estimation fails
+APPROVE_GAS_FALLBACK = 60_000
+
+# Allowance cache keyed by (chain_id, token, wallet) -> (allowance, expires_at)
+ALLOWANCE_CACHE_TTL = 30  # seconds
+_ALLOWANCE_CACHE: dict[tuple[int, str, str], tuple[int, float]] = {}
+
+# Query parameters of the 1inch API that carry addresses
+_ADDR_KEYS = frozenset(("tokenAddress", "walletAddress", "src", "dst", "from"))
+
+# Transaction fields that must be integers before signing
+_NUMERIC_KEYS = ("gas", "gasPrice", "value", "nonce", "maxFeePerGas", "maxPriorityFeePerGas")
+
+# Matches a 0x-prefixed 20-byte hex address
+_ADDR_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+
+# Minimal ERC-20 ABI with only the calls used by the swap flow
+ERC20_ABI = [{
+    "name": "allowance",
+    "inputs": [{"name": "owner", "type": "address"}, {"name": "spender", "type": "address"}],
+    "outputs": [{"name": "", "type": "uint256"}],
+    "stateMutability": "view",
+    "type": "function"
+}]
+
+# Headers sent with every 1inch API call (aiohttp already negotiates gzip/deflate, plus br when Brotli is installed)
+INCH_HEADERS = {
+    "Authorization": f"Bearer {INCH_API_KEY}",
+    "accept": "application/json"
+}
+
+@dataclass(frozen=True, slots=True)
+class ChainConfig:
+    """Static per-chain settings, built once at import instead of per swap"""
+    rpc_url: str
+    api_base_url: str
+    router: str
+    headers: Mapping[str, str]
+
+_CHAIN_CONFIG = {
+    chain_id: ChainConfig(
+        rpc_url=rpc_url,
+        api_base_url=f"https://api.1inch.dev/swap/v6.0/{chain_id}",
+        router=ROUTER_ADDRESS[chain_id],
+        headers=MappingProxyType(INCH_HEADERS)
+    )
+    for chain_id, rpc_url in CHAIN_RPC_URLS.items()
+}
+
+# One long-lived Web3 instance per chain so RPC connections are reused across swaps
+_W3_BY_CHAIN = {
+    chain_id: AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(
+        cfg.rpc_url,
+        request_kwargs={"timeout": aiohttp.ClientTimeout(total=10)}
+    ))
+    for chain_id, cfg in _CHAIN_CONFIG.items()
+}
+
+# Retry policy for transient 1inch API failures
+API_MAX_RETRIES = 3
+API_BACKOFF_FACTOR = 0.3  # seconds, doubled on each retry
+API_RETRY_STATUSES = frozenset((429, 502, 503, 504))
+
+# Shared token bucket for the 1inch API quota; only blocks once the bucket is empty
+INCH_API_RPS = float(os.getenv("INCH_API_RPS", "1"))
+if INCH_API_RPS <= 0:
+    raise ValueError("INCH_API_RPS must be a positive number")
+# The bucket capacity must hold at least one request, so express sub-1 rates as one request per longer period
+if INCH_API_RPS < 1:
+    _INCH_LIMITER = AsyncLimiter(max_rate=1, time_period=1 / INCH_API_RPS)
+else:
+    _INCH_LIMITER = AsyncLimiter(max_rate=INCH_API_RPS, time_period=1)
+
+@functools.lru_cache(maxsize=8192)
+def _cksum(addr_lower):
+    """Checksum a lowercase address, memoized since the same wallet/token/router addresses recur"""
+    return Web3.to_checksum_address(addr_lower)
+
+def _to_int(v):
+    """Parse a decimal or 0x-prefixed hex value, passing ints through"""
+    return v if type(v) is int else int(v, 0)
+
 app = FastAPI(title="1inch Swap API", description="API for performing token swaps via 1inch")
 
 # Configure CORS
@@ -31,6 +167,42 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+@app.on_event("startup")
+async def open_http_session():
+    # Shared HTTP session so every 1inch call reuses pooled keep-alive connections
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=10)
+    )
+
+@app.on_event("shutdown")
+async def close_http_session():
+    await app.state.http.close()
+
+@app.on_event("shutdown")
+async def close_rpc_providers():
+    # Close the aiohttp sessions cached by each chain's provider
+    for w3 in _W3_BY_CHAIN.values():
+        await w3.provider.disconnect()
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    # Flush any queued log records before the process exits
+    _log_listener.stop()
+
+@app.on_event("startup")
+async def start_sign_pool():
+    # ECDSA signing runs in worker processes so it never holds up the event loop.
+    # forkserver avoids forking this multi-threaded process, and preloading only the
+    # side-effect-free signer module keeps workers from loading the app.
+    mp_context = multiprocessing.get_context("forkserver")
+    mp_context.set_forkserver_preload(["signer"])
+    app.state.sign_pool = ProcessPoolExecutor(mp_context=mp_context)
+
+@app.on_event("shutdown")
+async def stop_sign_pool():
+    app.state.sign_pool.shutdown()
+
 class SwapRequest(BaseModel):
     wallet_address: str = Field(..., description="Wallet address to perform the swap from")
     private_key: str = Field(..., description="Private key for the wallet")
@@ -47,140 +219,169 @@ class SwapResponse(BaseModel):
     approval_tx_hash: Optional[str] = None
 
 class InchSwapper:
-    def __init__(self, wallet_address, private_key, chain_id):
-        self.chain_id = chain_id
-        self.api_key = INCH_API_KEY  # Use API key from environment
-        self.wallet_address = Web3.to_checksum_address(wallet_address)
-        self.private_key = private_key
-        
-        # Map chain IDs to their respective RPC URLs
-        chain_rpc_urls = {
-            1: "https://eth-mainnet.g.alchemy.com/v2/NMsHzNgJ7XUYtzNyFpEJ8yT4muQ_lkRF",      # Ethereum mainnet
-            10: "https://opt-mainnet.g.alchemy.com/v2/NMsHzNgJ7XUYtzNyFpEJ8yT4muQ_lkRF",     # Optimism mainnet
-            8453: "https://base-mainnet.g.alchemy.com/v2/NMsHzNgJ7XUYtzNyFpEJ8yT4muQ_lkRF",  # Base mainnet
-            42161: "https://arb-mainnet.g.alchemy.com/v2/NMsHzNgJ7XUYtzNyFpEJ8yT4muQ_lkRF"   # Arbitrum mainnet
-        }
-        
-        # Get the appropriate RPC URL for the specified chain ID
-        if chain_id not in chain_rpc_urls:
-            raise ValueError(f"Unsupported chain ID: {chain_id}. Supported chain IDs are: {list(chain_rpc_urls.keys())}")
-        
-        rpc_url = chain_rpc_urls[chain_id]
+    def __init__(self, wallet_address, private_key, chain_id, http, sign_pool):
+        if chain_id not in _CHAIN_CONFIG:
+            raise ValueError(f"Unsupported chain ID: {chain_id}. Supported chain IDs are: {list(_CHAIN_CONFIG.keys())}")
         
-        # Set up Web3 with the appropriate provider
-        self.web3 = Web3(Web3.HTTPProvider(rpc_url))
-        self.api_base_url = f"https://api.1inch.dev/swap/v6.0/{self.chain_id}"
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "accept": "application/json"
-        }
+        self.chain_id = chain_id
+        self.wallet_address = _cksum(wallet_address.lower())
+        # Keep the key as a mutable buffer so it can be wiped once the swap is done
+        self.private_key = bytearray.fromhex(private_key.removeprefix("0x"))
+        self.http = http
+        self.sign_pool = sign_pool
+        # Precomputed chain settings and the persistent provider (with its pooled connections)
+        self.cfg = _CHAIN_CONFIG[chain_id]
+        self.web3 = _W3_BY_CHAIN[chain_id]
+
+    def zeroize_private_key(self):
+        """Overwrite the private key bytes in place"""
+        self.private_key[:] = bytes(len(self.private_key))
 
     def to_checksum_address(self, address):
         """Convert address to checksum format"""
-        if isinstance(address, str) and address.startswith('0x'):
-            return Web3.to_checksum_address(address.lower())
-        return address
+        return _cksum(address.lower()) if isinstance(address, str) and address.startswith('0x') else address
 
     def convert_addresses_to_checksum(self, obj):
-        """Recursively convert all addresses in an object to checksum format"""
-        if isinstance(obj, dict):
-            return {k: self.convert_addresses_to_checksum(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self.convert_addresses_to_checksum(item) for item in obj]
-        elif isinstance(obj, str) and obj.startswith('0x') and len(obj) == 42:
-            try:
-                return self.to_checksum_address(obj)
-            except:
-                return obj
+        """Convert all addresses in a decoded API response to checksum format, in place"""
+        if isinstance(obj, str):
+            return _cksum(obj.lower()) if _ADDR_RE.fullmatch(obj) else obj
+
+        stack = [obj]
+        while stack:
+            container = stack.pop()
+            items = container.items() if isinstance(container, dict) else enumerate(container)
+            for key, value in items:
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+                elif isinstance(value, str) and _ADDR_RE.fullmatch(value):
+                    container[key] = _cksum(value.lower())
         return obj
 
     def api_request_url(self, method_name, query_params):
         """Construct full API request URL"""
         # Convert addresses in query parameters to checksum format
-        converted_params = {}
-        for key, value in query_params.items():
-            if key in ['tokenAddress', 'walletAddress', 'src', 'dst', 'from']:
-                try:
-                    converted_params[key] = self.to_checksum_address(value)
-                except:
-                    converted_params[key] = value
-            else:
-                converted_params[key] = value
-                
-        query_string = '&'.join([f'{key}={value}' for key, value in converted_params.items()])
-        return f"{self.api_base_url}{method_name}?{query_string}"
+        converted_params = tuple(
+            (key, self.to_checksum_address(value) if key in _ADDR_KEYS else value)
+            for key, value in query_params.items()
+        )
+        return f"{self.cfg.api_base_url}{method_name}?{urlencode(converted_params, safe=':,')}"
 
-    def check_allowance(self, token_address):
-        """Check token allowance for the wallet"""
-        try:
-            token_address = self.to_checksum_address(token_address)
-            url = self.api_request_url("/approve/allowance", {
-                "tokenAddress": token_address,
-                "walletAddress": self.wallet_address
-            })
-            
-            # Add delay before API call to avoid rate limiting
-            time.sleep(1)
-            
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json().get("allowance")
-        except requests.exceptions.RequestException as e:
-            print(f"Error checking allowance: {str(e)}")
-            return "0"
-
-    async def build_tx_for_approve_trade_with_router(self, token_address, amount=None):
-        """Build transaction for token approval"""
+    async def api_get(self, url):
+        """GET a 1inch API URL and return the decoded JSON, retrying transient failures"""
+        for attempt in range(API_MAX_RETRIES + 1):
+            delay = API_BACKOFF_FACTOR * 2 ** attempt
+            try:
+                async with _INCH_LIMITER:
+                    async with self.http.get(url, headers=self.cfg.headers) as response:
+                        if response.status in API_RETRY_STATUSES and attempt < API_MAX_RETRIES:
+                            # Honour the server's Retry-After (in seconds) when rate limited
+                            retry_after = response.headers.get("Retry-After", "")
+                            if response.status == 429 and retry_after.isdigit():
+                                delay = max(delay, int(retry_after))
+                        else:
+                            response.raise_for_status()
+                            return orjson.loads(await response.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                # Dropped connections and timeouts are retried like transient 5xx responses
+                if attempt >= API_MAX_RETRIES:
+                    raise
+                logger.warning("1inch API request failed, retrying: %s", e)
+            await asyncio.sleep(delay)
+
+    def allowance_call(self, token_address):
+        """Build the ERC-20 allowance(wallet, router) contract call for a token"""
+        token = self.web3.eth.contract(address=token_address, abi=ERC20_ABI)
+        return token.functions.allowance(self.wallet_address, self.cfg.router)
+
+    def allowance_cache_key(self, token_address):
+        """Key for the allowance cache"""
+        return (self.chain_id, token_address.lower(), self.wallet_address.lower())
+
+    def get_cached_allowance(self, token_address):
+        """Return the cached allowance for a token, or None if missing or expired"""
+        entry = _ALLOWANCE_CACHE.get(self.allowance_cache_key(token_address))
+        if entry and time.time() < entry[1]:
+            return entry[0]
+        return None
+
+    def cache_allowance(self, token_address, allowance):
+        """Cache an allowance; unlimited approvals stay cached until invalidated"""
+        expires_at = float("inf") if allowance == MAX_UINT256 else time.time() + ALLOWANCE_CACHE_TTL
+        _ALLOWANCE_CACHE[self.allowance_cache_key(token_address)] = (allowance, expires_at)
+
+    def spend_cached_allowance(self, token_address, amount):
+        """Deduct a sent swap's amount from a finite cached allowance so the cache never overstates it"""
+        key = self.allowance_cache_key(token_address)
+        entry = _ALLOWANCE_CACHE.get(key)
+        if entry and entry[0] != MAX_UINT256:
+            _ALLOWANCE_CACHE[key] = (max(entry[0] - amount, 0), entry[1])
+
+    def invalidate_allowance(self, token_address):
+        """Drop the cached allowance so the next check re-reads it on-chain"""
+        _ALLOWANCE_CACHE.pop(self.allowance_cache_key(token_address), None)
+
+    async def fetch_swap_state(self, token_address):
+        """Fetch nonce, gas price and token allowance in a single batched RPC round-trip"""
+        token_address = self.to_checksum_address(token_address)
+        # Native token swaps never need an approval
+        if token_address.lower() == NATIVE_TOKEN_ADDRESS.lower():
+            allowance = MAX_UINT256
+        else:
+            allowance = self.get_cached_allowance(token_address)
+
+        async with self.web3.batch_requests() as batch:
+            batch.add(self.web3.eth.get_transaction_count(self.wallet_address, "pending"))
+            batch.add(self.web3.eth.gas_price)
+            if allowance is None:
+                batch.add(self.allowance_call(token_address))
+            responses = await batch.async_execute()
+
+        if allowance is None:
+            allowance = responses[2]
+            self.cache_allowance(token_address, allowance)
+
+        return {
+            "nonce": responses[0],
+            "gas_price": responses[1],
+            "allowance": allowance
+        }
+
+    async def build_tx_for_approve_trade_with_router(self, token_address, amount=MAX_UINT256, nonce=None, gas_price=None):
+        """Build transaction approving the 1inch router to spend a token"""
         try:
             token_address = self.to_checksum_address(token_address)
-            params = {"tokenAddress": token_address}
-            if amount:
-                params["amount"] = amount
-                
-            url = self.api_request_url("/approve/transaction", params)
             
-            # Add delay before API call to avoid rate limiting
-            await asyncio.sleep(2)
+            # approve(router, amount) calldata is static per chain, so build it locally instead of asking 1inch
+            router = bytes.fromhex(self.cfg.router[2:])
+            calldata = ERC20_APPROVE_SELECTOR + router.rjust(32, b"\0") + int(amount).to_bytes(32, "big")
+            transaction = {
+                'to': token_address,
+                'data': "0x" + calldata.hex(),
+                'value': 0,
+                'from': self.wallet_address,
+                'chainId': self.chain_id
+            }
             
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            transaction = response.json()
+            # Add necessary transaction fields, reusing the prefetched nonce/gas price when given
+            if nonce is None:
+                nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
+            if gas_price is None:
+                gas_price = await self.web3.eth.gas_price
+            transaction['nonce'] = nonce
+            transaction['gasPrice'] = gas_price
             
-            # Convert all addresses in transaction to checksum format
-            transaction = self.convert_addresses_to_checksum(transaction)
-            
-            # Ensure critical fields are checksummed
-            if 'to' in transaction:
-                transaction['to'] = self.to_checksum_address(transaction['to'])
-            transaction['from'] = self.wallet_address
-            
-            # Add necessary transaction fields
-            transaction['nonce'] = self.web3.eth.get_transaction_count(self.wallet_address)
-            transaction['chainId'] = self.chain_id
-            transaction['value'] = 0  # Ensure value field exists
-            
-            # Estimate gas
             try:
-                gas_limit = self.web3.eth.estimate_gas({
-                    **transaction,
-                    "from": self.wallet_address
-                })
-                transaction['gas'] = gas_limit
+                transaction['gas'] = await self.web3.eth.estimate_gas(transaction)
             except Exception as e:
-                print(f"Gas estimation failed: {str(e)}")
-                transaction['gas'] = 500000  # Fallback gas limit
-            
-            # Convert all numeric values to integers
-            for key in ['gas', 'gasPrice', 'value', 'nonce']:
-                if key in transaction and not isinstance(transaction[key], int):
-                    transaction[key] = int(transaction[key], 16) if isinstance(transaction[key], str) and transaction[key].startswith('0x') else int(transaction[key])
+                logger.warning("Gas estimation failed: %s", e)
+                transaction['gas'] = APPROVE_GAS_FALLBACK
             
             return transaction
         except Exception as e:
-            print(f"Error building approval transaction: {str(e)}")
+            logger.error("Error building approval transaction: %s", e)
             raise  # Re-raise the exception for better error tracking
 
-    def build_tx_for_swap(self, swap_params):
+    async def build_tx_for_swap(self, swap_params, nonce=None, gas_price=None):
         """Build transaction for token swap"""
         try:
             # Convert addresses in swap parameters
@@ -190,49 +391,44 @@ class InchSwapper:
             converted_params['from'] = self.to_checksum_address(swap_params['from'])
 
             url = self.api_request_url("/swap", converted_params)
-            
-            # Add delay before API call to avoid rate limiting
-            time.sleep(3)
-            
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            transaction = response.json()["tx"]
+            transaction = (await self.api_get(url))["tx"]
             
             # Convert all addresses in transaction to checksum format
-            transaction = self.convert_addresses_to_checksum(transaction)
-            
-            # Ensure critical fields are checksummed
-            if 'to' in transaction:
-                transaction['to'] = self.to_checksum_address(transaction['to'])
+            self.convert_addresses_to_checksum(transaction)
             transaction['from'] = self.wallet_address
             
-            # Add necessary transaction fields
-            transaction['nonce'] = self.web3.eth.get_transaction_count(self.wallet_address)
+            # Add necessary transaction fields, reusing the prefetched nonce/gas price when given
+            if nonce is None:
+                nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
+            transaction['nonce'] = nonce
             transaction['chainId'] = self.chain_id
+            if 'gasPrice' not in transaction and gas_price is not None:
+                transaction['gasPrice'] = gas_price
             
             # Ensure gas is set - fix for "intrinsic gas too low" error
             if 'gas' not in transaction or transaction['gas'] == 0:
                 try:
                     # Try to estimate gas
-                    gas_limit = self.web3.eth.estimate_gas({
+                    gas_limit = await self.web3.eth.estimate_gas({
                         **transaction,
                         "from": self.wallet_address
                     })
                     transaction['gas'] = gas_limit
                 except Exception as e:
-                    print(f"Gas estimation failed: {str(e)}")
+                    logger.warning("Gas estimation failed: %s", e)
                     # Set a higher fallback gas limit for swap transactions
                     transaction['gas'] = 500000  # Higher fallback value for swaps
             
             # Convert all numeric values to integers
-            for key in ['gas', 'gasPrice', 'value', 'nonce']:
-                if key in transaction and not isinstance(transaction[key], int):
-                    transaction[key] = int(transaction[key], 16) if isinstance(transaction[key], str) and transaction[key].startswith('0x') else int(transaction[key])
+            for key in _NUMERIC_KEYS:
+                value = transaction.get(key)
+                if value is not None:
+                    transaction[key] = _to_int(value)
             
-            print(f"Final gas value: {transaction['gas']}")
+            logger.debug("Final gas value: %s", transaction['gas'])
             return transaction
         except Exception as e:
-            print(f"Error building swap transaction: {str(e)}")
+            logger.error("Error building swap transaction: %s", e)
             return None
 
     async def sign_and_send_transaction(self, transaction):
@@ -241,18 +437,31 @@ class InchSwapper:
             # Double-check gas is present and non-zero
             if 'gas' not in transaction or transaction['gas'] == 0:
                 transaction['gas'] = 500000  # Fallback gas value
-                print(f"Added fallback gas value: {transaction['gas']}")
+                logger.warning("Added fallback gas value: %s", transaction['gas'])
                 
-            signed_tx = self.web3.eth.account.sign_transaction(
-                transaction_dict=transaction,
-                private_key=self.private_key
+            raw_tx = await asyncio.get_running_loop().run_in_executor(
+                self.sign_pool, signer.sign_transaction, transaction, self.private_key
             )
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = await self.web3.eth.send_raw_transaction(raw_tx)
             return self.web3.to_hex(tx_hash)
         except Exception as e:
-            print(f"Error signing/sending transaction: {str(e)}")
+            logger.error("Error signing/sending transaction: %s", e)
             raise
 
+    async def wait_for_transaction_receipt(self, tx_hash, timeout=120):
+        """Poll for a transaction receipt with exponential backoff, without blocking the event loop"""
+        deadline = time.monotonic() + timeout
+        delay = RECEIPT_POLL_INITIAL
+        while True:
+            # A freshly sent transaction is never mined instantly, so wait before each poll
+            await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            try:
+                return await self.web3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Transaction {tx_hash} was not mined within {timeout} seconds")
+                delay = min(delay * 2, RECEIPT_POLL_MAX)
+
     async def perform_swap(self, src_token, dst_token, amount, slippage=1):
         """Main function to perform the complete swap process"""
         result = {
@@ -266,31 +475,63 @@ class InchSwapper:
         src_token = self.to_checksum_address(src_token)
         dst_token = self.to_checksum_address(dst_token)
 
-        print("Checking token allowance...")
-        allowance = self.check_allowance(src_token)
-        print(f"Current allowance: {allowance}")
+        swap_params = {
+            "src": src_token,
+            "dst": dst_token,
+            "amount": amount,
+            "from": self.wallet_address,
+            "slippage": slippage,
+            "disableEstimate": False,
+            "allowPartialFill": True
+        }
+
+        logger.info("Fetching nonce, gas price and token allowance...")
+        try:
+            state = await self.fetch_swap_state(src_token)
+        except Exception as e:
+            # Without a nonce no transaction can be built, so report the failure instead of guessing
+            logger.error("Error fetching nonce, gas price and allowance: %s", e)
+            result["message"] = "Failed to fetch wallet state from the RPC provider"
+            return result
+        allowance = state["allowance"]
+        nonce = state["nonce"]
+        logger.debug("Current allowance: %s", allowance)
 
-        if int(allowance) < int(amount):
-            print("\nInsufficient allowance. An approval transaction is required.")
+        # Fast path: an existing (typically unlimited) allowance skips the approval flow entirely
+        if allowance < int(amount):
+            logger.info("Insufficient allowance. An approval transaction is required.")
             
             # Use hardcoded AUTO_APPROVE value
             if AUTO_APPROVE:
-                print("\nCreating approval transaction...")
-                approval_tx = await self.build_tx_for_approve_trade_with_router(src_token)
+                logger.info("Creating approval transaction...")
+                # Approve the maximum so later swaps of this token take the fast path
+                approval_tx = await self.build_tx_for_approve_trade_with_router(
+                    src_token,
+                    amount=MAX_UINT256,
+                    nonce=nonce,
+                    gas_price=state["gas_price"]
+                )
                 
                 if approval_tx:
-                    print("Sending approval transaction...")
-                    print(f"Nonce: {approval_tx['nonce']}")
-                    print(f"Gas limit set to: {approval_tx['gas']}")
+                    logger.info("Sending approval transaction...")
+                    logger.debug("Nonce: %s", approval_tx['nonce'])
+                    logger.debug("Gas limit set to: %s", approval_tx['gas'])
                     
                     approve_tx_hash = await self.sign_and_send_transaction(approval_tx)
                     
                     if approve_tx_hash:
-                        print(f"Approval transaction hash: {approve_tx_hash}")
+                        nonce += 1
+                        logger.info("Approval transaction hash: %s", approve_tx_hash)
                         result["approval_tx_hash"] = approve_tx_hash
-                        print("Waiting for approval transaction to be mined...")
-                        self.web3.eth.wait_for_transaction_receipt(approve_tx_hash)
-                        print("Approval transaction confirmed!")
+                        logger.info("Waiting for approval transaction to be mined...")
+                        receipt = await self.wait_for_transaction_receipt(approve_tx_hash)
+                        if receipt["status"] == 1:
+                            logger.info("Approval transaction confirmed!")
+                            self.cache_allowance(src_token, MAX_UINT256)
+                        else:
+                            self.invalidate_allowance(src_token)
+                            result["message"] = "Approval transaction reverted"
+                            return result
                     else:
                         result["message"] = "Failed to send approval transaction"
                         return result
@@ -301,31 +542,19 @@ class InchSwapper:
                 result["message"] = "Insufficient allowance and auto-approve is disabled"
                 return result
 
-        # Add delay before building swap transaction
-        await asyncio.sleep(2)
-
-        swap_params = {
-            "src": src_token,
-            "dst": dst_token,
-            "amount": amount,
-            "from": self.wallet_address,
-            "slippage": slippage,
-            "disableEstimate": False,
-            "allowPartialFill": True
-        }
-
-        print("\nBuilding swap transaction...")
-        swap_tx = self.build_tx_for_swap(swap_params)
+        logger.info("Building swap transaction...")
+        swap_tx = await self.build_tx_for_swap(swap_params, nonce=nonce, gas_price=state["gas_price"])
         
         if swap_tx:
-            print(f"Nonce: {swap_tx['nonce']}")
-            print(f"Gas limit set to: {swap_tx.get('gas', 'auto')}")
+            logger.debug("Nonce: %s", swap_tx['nonce'])
+            logger.debug("Gas limit set to: %s", swap_tx.get('gas', 'auto'))
             
-            print("Sending swap transaction...")
+            logger.info("Sending swap transaction...")
             swap_tx_hash = await self.sign_and_send_transaction(swap_tx)
             
             if swap_tx_hash:
-                print(f"Swap transaction hash: {swap_tx_hash}")
+                logger.info("Swap transaction hash: %s", swap_tx_hash)
+                self.spend_cached_allowance(src_token, int(amount))
                 result["success"] = True
                 result["message"] = "Swap completed successfully"
                 result["tx_hash"] = swap_tx_hash
@@ -334,6 +563,8 @@ class InchSwapper:
                 result["message"] = "Failed to send swap transaction"
                 return result
         else:
+            # A stale cached allowance may have skipped a needed approval
+            self.invalidate_allowance(src_token)
             result["message"] = "Failed to build swap transaction"
             return result
 
@@ -343,15 +574,20 @@ async def swap_tokens(swap_request: SwapRequest):
         swapper = InchSwapper(
             swap_request.wallet_address,
             swap_request.private_key,
-            chain_id=swap_request.chain_id
+            chain_id=swap_request.chain_id,
+            http=app.state.http,
+            sign_pool=app.state.sign_pool
         )
         
-        result = await swapper.perform_swap(
-            swap_request.src_token,
-            swap_request.dst_token,
-            swap_request.amount,
-            slippage=swap_request.slippage
-        )
+        try:
+            result = await swapper.perform_swap(
+                swap_request.src_token,
+                swap_request.dst_token,
+                swap_request.amount,
+                slippage=swap_request.slippage
+            )
+        finally:
+            swapper.zeroize_private_key()
         
         return result
     except Exception as e:
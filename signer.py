@@ -0,0 +1,12 @@
+# Entry point for the signer worker processes. Kept free of import-time side effects
+# (no env loading, logging threads or providers) so workers only load eth_account.
+from eth_account import Account
+
+
+def sign_transaction(transaction, private_key):
+    """Sign a transaction in a signer worker process and return the raw signed bytes"""
+    try:
+        return bytes(Account.sign_transaction(transaction, bytes(private_key)).raw_transaction)
+    finally:
+        # Wipe the worker's unpickled copy; the immutable bytes handed to eth_account cannot be wiped
+        private_key[:] = bytes(len(private_key))